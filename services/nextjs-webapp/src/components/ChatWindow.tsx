@@ -34,6 +34,10 @@ export default function ChatWindow({ isRecording = false }: ChatWindowProps) {
   const messagesEndRef = useRef<HTMLDivElement>(null)
   const wsRef = useRef<WebSocket | null>(null)
   const prevIsRecordingRef = useRef<boolean>(false)
+  // Memory message waiting for its thumbnail, which arrives as the next binary frame
+  const pendingThumbnailRef = useRef<{ messageId: string; mimeType: string } | null>(null)
+  // Object URLs created for thumbnails, revoked on unmount so their Blobs can be freed
+  const thumbnailUrlsRef = useRef<string[]>([])
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
@@ -43,6 +47,14 @@ export default function ChatWindow({ isRecording = false }: ChatWindowProps) {
     scrollToBottom()
   }, [messages])
 
+  useEffect(() => {
+    const thumbnailUrls = thumbnailUrlsRef.current
+    return () => {
+      thumbnailUrls.forEach((url) => URL.revokeObjectURL(url))
+      thumbnailUrls.length = 0
+    }
+  }, [])
+
   const connectWebSocket = useCallback(() => {
     const wsUrl = typeof window !== 'undefined'
       ? `ws://${window.location.hostname}:8000/ws`
@@ -55,47 +67,84 @@ export default function ChatWindow({ isRecording = false }: ChatWindowProps) {
       console.log('Connected to agent')
     }
 
-    ws.onmessage = (event) => {
-      try {
-        const data = JSON.parse(event.data)
-        if (data.type === 'response') {
+    const handleEvent = (data: any) => {
+      if (data.type === 'batch') {
+        // Several events coalesced into one frame; dispatch them in order
+        data.items.forEach(handleEvent)
+      } else if (data.type === 'response') {
+        setMessages((prev) => [
+          ...prev,
+          {
+            id: Date.now().toString(),
+            role: 'assistant',
+            content: data.content,
+            timestamp: new Date(),
+          },
+        ])
+        setIsLoading(false)
+      } else if (data.type === 'memory_injected') {
+        // Memory was injected - show it immediately
+        if (data.metadata) {
+          const messageId = Date.now().toString() + '-memory'
+          if (data.has_thumbnail) {
+            pendingThumbnailRef.current = {
+              messageId,
+              mimeType: data.metadata.thumbnail_mime_type || 'image/png',
+            }
+          }
           setMessages((prev) => [
             ...prev,
             {
-              id: Date.now().toString(),
-              role: 'assistant',
-              content: data.content,
+              id: messageId,
+              role: 'memory',
+              content: `Memory retrieved: ${data.metadata.description}`,
               timestamp: new Date(),
+              imageCount: data.metadata.image_count,
             },
           ])
-          setIsLoading(false)
-        } else if (data.type === 'memory_injected') {
-          // Memory was injected - show it immediately
-          if (data.metadata) {
-            setMessages((prev) => [
-              ...prev,
-              {
-                id: Date.now().toString() + '-memory',
-                role: 'memory',
-                content: `Memory retrieved: ${data.metadata.description}`,
-                timestamp: new Date(),
-                thumbnail: data.metadata.thumbnail,
-                imageCount: data.metadata.image_count,
-              },
-            ])
-          }
-        } else if (data.type === 'status') {
-          // Handle status updates (e.g., "thinking", "executing action")
-          console.log('Status:', data.content)
-        } else if (data.type === 'recording_status') {
-          // Handle recording status updates
-          if (data.session_id) {
-            setSessionId(data.session_id)
-            console.log('Recording session ID:', data.session_id)
-          } else {
-            setSessionId(null)
-          }
         }
+      } else if (data.type === 'status') {
+        // Handle status updates (e.g., "thinking", "executing action")
+        console.log('Status:', data.content)
+      } else if (data.type === 'tool_call') {
+        // Progress while the agent works through a multi-step turn
+        console.log('Tool call:', data.name, data.arguments)
+      } else if (data.type === 'tool_result') {
+        if (data.error) {
+          console.warn('Tool failed:', data.name, data.error)
+        } else {
+          console.log('Tool result:', data.name, `(${data.image_count} image(s))`)
+        }
+      } else if (data.type === 'recording_status') {
+        // Handle recording status updates
+        if (data.session_id) {
+          setSessionId(data.session_id)
+          console.log('Recording session ID:', data.session_id)
+        } else {
+          setSessionId(null)
+        }
+      }
+    }
+
+    ws.onmessage = (event) => {
+      if (event.data instanceof Blob) {
+        // Binary frame: thumbnail for the preceding memory_injected message
+        const pending = pendingThumbnailRef.current
+        pendingThumbnailRef.current = null
+        if (pending) {
+          const thumbnail = URL.createObjectURL(new Blob([event.data], { type: pending.mimeType }))
+          thumbnailUrlsRef.current.push(thumbnail)
+          setMessages((prev) =>
+            prev.map((message) =>
+              message.id === pending.messageId ? { ...message, thumbnail } : message
+            )
+          )
+        }
+        return
+      }
+
+      try {
+        handleEvent(JSON.parse(event.data))
       } catch (e) {
         console.error('Failed to parse message:', e)
       }
@@ -1,9 +1,12 @@
 import asyncio
-import base64
+import contextlib
+import hashlib
 import json
 import logging
 import os
 import random
+import re
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -11,9 +14,11 @@ from uuid import uuid4
 
 import aiohttp
 import google.generativeai as genai
+import orjson
+from cachetools import TTLCache
 from google.ai.generativelanguage_v1beta.types.content import Part as GenaiPart
 from google.api_core import exceptions as google_exceptions
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from mcp_client import MCPClient, MCPToolResult
 from models import AgentResponse
@@ -36,6 +41,18 @@ MAX_ITERATIONS = 30
 # Maximum consecutive failures per step before asking user for guidance
 MAX_RETRIES_PER_STEP = 3
 
+# Maximum chat history entries from earlier turns kept after the pinned prefix (system
+# prompt, demo). Must be even so the kept window starts on a user entry.
+MAX_HISTORY = 50
+
+# Most recent entries from earlier turns (two exchanges) that keep their inline images
+IMAGE_HISTORY_ENTRIES = 4
+
+# Cache of tool-free replies for repeated prompts, shared across agents
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 300  # seconds
+_response_cache: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
 # Exponential backoff settings for API rate limiting (429 errors)
 API_MAX_RETRIES = 5
 API_BASE_DELAY = 1.0  # Base delay in seconds
@@ -45,29 +62,83 @@ API_EXPONENTIAL_BASE = 2  # Exponential backoff multiplier
 # Logs directory for dumping context
 LOGS_DIR = Path("/app/logs")
 
+# Whether to dump chat context to LOGS_DIR for debugging (disabled by default)
+DUMP_CONTEXT_ENABLED = os.getenv("AGENT_DUMP_CONTEXT", "false").lower() in ("true", "1", "yes")
+
 # Demo directory for image demonstrations
 DEMO_DIR = Path(os.getenv("DEMO_DIR", "/app/demo"))
 
 # Whether to load demo content (disabled by default)
 DEMO_ENABLED = os.getenv("DEMO_ENABLED", "false").lower() in ("true", "1", "yes")
 
+# JSON mode: replies are a bare AgentResponse object, parsed without looking for a ```json fence.
+# No response_schema, since ToolCall.arguments is a free-form object Gemini schemas can't express.
+GENERATION_CONFIG = genai.GenerationConfig(response_mime_type="application/json")
+
+# Model acknowledgement that closes the system prompt exchange
+SYSTEM_PROMPT_ACK = "Understood. I'm ready to help you interact with the browser. What would you like me to do?"
+
+# Tool result reminders, built once as Parts so the SDK doesn't re-wrap them every turn
+TOOL_RESULT_REMINDER_PART = genai.protos.Part(text=TOOL_RESULT_REMINDER)
+TOOL_RESULT_REMINDER_WITH_IMAGE_PART = genai.protos.Part(text=TOOL_RESULT_REMINDER_WITH_IMAGE)
+
+# Validator for structured LLM responses, built once instead of per parse
+_AGENT_RESPONSE_ADAPTER = TypeAdapter(AgentResponse)
+
+# Fenced ```json block in an LLM response
+_JSON_FENCE_RE = re.compile(r"```json(.*?)```", re.DOTALL)
+
+# Decoder used to read the leading JSON object of an inline response
+_JSON_DECODER = json.JSONDecoder()
+
+# "user_message": "..." in malformed JSON, handling both single and multi-line values
+_USER_MESSAGE_RE = re.compile(r'"user_message"\s*:\s*"((?:[^"\\]|\\.)*)"\s*[,}]', re.DOTALL)
+
+
+def _hash_field(digest: "hashlib.blake2b", tag: bytes, data: bytes) -> None:
+    """Feed one tagged, length-prefixed field into a digest.
+
+    The framing keeps field boundaries unambiguous, so histories such as
+    parts "ab", "c" and "a", "bc" never hash to the same stream.
+    """
+    digest.update(tag)
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
 
 class BrowserAgent:
+    # System prompt exchange shared by agents on the shared MCP client, set at startup
+    _CACHED_HISTORY: tuple[dict, ...] | None = None
+
+    # Rendered system prompts keyed by the tools description they were built from
+    _SYSTEM_PROMPT_CACHE: dict[str, str] = {}
+
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
 
         genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        self.model = genai.GenerativeModel("gemini-2.0-flash", generation_config=GENERATION_CONFIG)
         self.chat = None
         self.mcp_client: MCPClient | None = None
         self.rag_retriever: RAGRetriever | None = None
+        # Shared pooled HTTP session for video buffer requests (set by the app)
+        self.http_session: aiohttp.ClientSession | None = None
         self.conversation_history = []
+        # Leading history entries never trimmed (system prompt and demo exchanges)
+        self._pinned_history_len = 0
         self.is_recording = False
         self.screenshot_counter = 0
         self.demo_injected = False
         self.recording_session_id: str | None = None
+        # Screenshots written for the current (or most recent) recording session
+        self.recorded_session_id: str | None = None
+        self.recorded_screenshots: list[str] = []
+        # Serializes context dumps so concurrent writes don't thrash the disk
+        self._dump_lock = asyncio.Lock()
+        # Strong references to in-flight background tasks (context dumps)
+        self._background_tasks: set[asyncio.Task] = set()
 
     async def _send_message_with_retry(self, message) -> str:
         """Send a message to Gemini with exponential backoff for rate limiting.
@@ -100,12 +171,12 @@ class BrowserAgent:
                     delay = delay + jitter
 
                     logger.warning(
-                        f"Rate limited (429). Retrying in {delay:.1f}s "
-                        f"(attempt {attempt + 1}/{API_MAX_RETRIES})"
+                        "Rate limited (429). Retrying in %.1fs (attempt %d/%d)",
+                        delay, attempt + 1, API_MAX_RETRIES,
                     )
                     await asyncio.sleep(delay)
                 else:
-                    logger.error(f"Rate limit retries exhausted after {API_MAX_RETRIES} attempts")
+                    logger.error("Rate limit retries exhausted after %d attempts", API_MAX_RETRIES)
             except Exception:
                 # For non-rate-limit errors, don't retry
                 raise
@@ -119,32 +190,86 @@ class BrowserAgent:
         await self.mcp_client.connect()
 
         # Initialize chat with system prompt
-        system_prompt = self._build_system_prompt()
-        self.conversation_history = [
-            {"role": "user", "parts": [system_prompt]},
-            {"role": "model", "parts": ["Understood. I'm ready to help you interact with the browser. What would you like me to do?"]}
-        ]
+        self.start_chat()
+
+    @classmethod
+    def cache_initial_history(cls, mcp_client: MCPClient) -> None:
+        """Build the system prompt exchange once for all agents sharing mcp_client."""
+        cls._CACHED_HISTORY = (
+            {"role": "user", "parts": [cls._system_prompt_for(mcp_client.tools_description)]},
+            {"role": "model", "parts": [SYSTEM_PROMPT_ACK]},
+        )
+
+    def start_chat(self) -> None:
+        """Start a fresh chat seeded with the system prompt exchange.
+
+        Uses the history cached by cache_initial_history when available, so
+        agents created per connection don't rebuild the system prompt.
+        """
+        if BrowserAgent._CACHED_HISTORY is not None:
+            self.conversation_history = [dict(m, parts=list(m["parts"])) for m in BrowserAgent._CACHED_HISTORY]
+        else:
+            self.conversation_history = [
+                {"role": "user", "parts": [self._build_system_prompt()]},
+                {"role": "model", "parts": [SYSTEM_PROMPT_ACK]},
+            ]
 
         self.chat = self.model.start_chat(history=self.conversation_history)
+        self._pinned_history_len = len(self.conversation_history)
+
+    def _trim_history(self) -> None:
+        """Bound the history carried over from earlier turns.
+
+        Keeps the pinned prefix plus the last MAX_HISTORY entries, and replaces
+        images older than the last two exchanges with a text placeholder, since
+        image blobs dominate the request size. Called once at the start of each
+        turn, so the current turn's request, RAG screenshots and tool results
+        are never trimmed or stripped while the agent is still acting on them.
+        """
+        chat = self.chat
+        assert chat is not None, "chat not started"
+        history = list(chat.history)
+        pinned = self._pinned_history_len
+        changed = False
+
+        if len(history) > pinned + MAX_HISTORY:
+            history = history[:pinned] + history[-MAX_HISTORY:]
+            changed = True
+
+        for i in range(pinned, len(history) - IMAGE_HISTORY_ENTRIES):
+            content = history[i]
+            if any("inline_data" in part for part in content.parts):
+                history[i] = genai.protos.Content(
+                    role=content.role,
+                    parts=[
+                        genai.protos.Part(text="[Image omitted from earlier turn]") if "inline_data" in part else part
+                        for part in content.parts
+                    ],
+                )
+                changed = True
+
+        if changed:
+            self.conversation_history = history
+            self.chat = self.model.start_chat(history=history)
 
     def _load_demo_content(self) -> tuple[list | None, dict | None]:
         """Load demo images and description from the demo folder.
 
         Returns a tuple of:
             - list of message parts (text + images) if demo content exists, or None
-            - dict with metadata (description, thumbnail_base64) for UI display, or None
+            - dict with metadata (description, raw thumbnail bytes and mime type) for UI display, or None
         """
         if not DEMO_ENABLED:
             logger.info("Demo content disabled via DEMO_ENABLED env var")
             return None, None
 
         if not DEMO_DIR.exists():
-            logger.info(f"Demo directory not found: {DEMO_DIR}")
+            logger.info("Demo directory not found: %s", DEMO_DIR)
             return None, None
 
         description_path = DEMO_DIR / "description.txt"
         if not description_path.exists():
-            logger.info(f"Demo description not found: {description_path}")
+            logger.info("Demo description not found: %s", description_path)
             return None, None
 
         # Read the description
@@ -158,7 +283,7 @@ class BrowserAgent:
         )
 
         if not image_files:
-            logger.info(f"No demo images found in {DEMO_DIR}")
+            logger.info("No demo images found in %s", DEMO_DIR)
             return None, None
 
         # Build the message parts
@@ -174,7 +299,8 @@ class BrowserAgent:
         parts.append(intro_text)
 
         # Track first image for thumbnail
-        thumbnail_base64 = None
+        thumbnail: bytes | None = None
+        thumbnail_mime_type: str | None = None
 
         # Add each image
         for i, image_path in enumerate(image_files):
@@ -194,19 +320,21 @@ class BrowserAgent:
                     inline_data={"mime_type": mime_type, "data": image_data}
                 )
                 parts.append(image_part)
-                logger.info(f"Loaded demo image: {image_path.name} ({len(image_data)} bytes)")
+                logger.info("Loaded demo image: %s (%d bytes)", image_path.name, len(image_data))
 
                 # Use first image as thumbnail
                 if i == 0:
-                    thumbnail_base64 = f"data:{mime_type};base64,{base64.b64encode(image_data).decode()}"
+                    thumbnail = image_data
+                    thumbnail_mime_type = mime_type
             except Exception as e:
-                logger.warning(f"Failed to load demo image {image_path}: {e}")
+                logger.warning("Failed to load demo image %s: %s", image_path, e)
 
-        logger.info(f"Loaded {len(image_files)} demo images")
+        logger.info("Loaded %d demo images", len(image_files))
 
         metadata = {
             "description": description_text,
-            "thumbnail": thumbnail_base64,
+            "thumbnail": thumbnail,
+            "thumbnail_mime_type": thumbnail_mime_type,
             "image_count": len(image_files),
         }
 
@@ -225,19 +353,39 @@ class BrowserAgent:
             return None
 
         self.demo_injected = True
-        demo_parts, metadata = self._load_demo_content()
+        demo_parts, metadata = await asyncio.to_thread(self._load_demo_content)
 
         if demo_parts:
             await self._send_message_with_retry(demo_parts)
+            # Keep the demonstration (and its images) for the whole conversation
+            self._pinned_history_len = len(self.chat.history)
             logger.info("Injected demo content into conversation")
             return metadata
 
         return None
 
+    @classmethod
+    def _system_prompt_for(cls, tools_desc: str) -> str:
+        """Return the system prompt for a tools description, building it on first use."""
+        system_prompt = cls._SYSTEM_PROMPT_CACHE.get(tools_desc)
+        if system_prompt is None:
+            system_prompt = cls._SYSTEM_PROMPT_CACHE[tools_desc] = build_system_prompt(tools_desc)
+        return system_prompt
+
     def _build_system_prompt(self) -> str:
         """Build system prompt with available tools and their parameter schemas."""
-        tools = self.mcp_client.get_tools_for_llm() if self.mcp_client else []
-        return build_system_prompt(tools)
+        tools_desc = self.mcp_client.tools_description if self.mcp_client else ""
+        return self._system_prompt_for(tools_desc)
+
+    def reset(self) -> None:
+        """Reset per-conversation state so the agent can serve a new connection."""
+        self.is_recording = False
+        self.recording_session_id = None
+        self.recorded_session_id = None
+        self.recorded_screenshots = []
+        self.screenshot_counter = 0
+        self.demo_injected = False
+        self.start_chat()
 
     def set_recording(self, enabled: bool):
         """Enable or disable recording mode."""
@@ -247,12 +395,14 @@ class BrowserAgent:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             session_uuid = str(uuid4())[:8]
             self.recording_session_id = f"{timestamp}_{session_uuid}"
+            self.recorded_session_id = self.recording_session_id
+            self.recorded_screenshots = []
             self.screenshot_counter = 0
             # Create screenshots directory if it doesn't exist
             os.makedirs("/tmp/screenshots", exist_ok=True)
-            logger.info(f"Recording mode enabled - Session ID: {self.recording_session_id}")
+            logger.info("Recording mode enabled - Session ID: %s", self.recording_session_id)
         else:
-            logger.info(f"Recording mode disabled - Session ID: {self.recording_session_id}")
+            logger.info("Recording mode disabled - Session ID: %s", self.recording_session_id)
             self.recording_session_id = None
 
     async def _capture_screenshot(self, event_type: str, offset_ms: int = 100) -> str | None:
@@ -265,45 +415,69 @@ class BrowserAgent:
         Returns:
             Path to saved screenshot file, or None if failed
         """
+        # The session this frame belongs to; recording may stop while the frame is fetched
+        session_id = self.recording_session_id
+
         try:
             # Query video buffer for historical frame
             url = f"{VIDEO_BUFFER_URL}/frame?offset_ms={offset_ms}"
-            logger.debug(f"Requesting frame from video buffer: {url} (event: {event_type})")
+            logger.debug("Requesting frame from video buffer: %s (event: %s)", url, event_type)
 
-            async with aiohttp.ClientSession() as session:
+            # Reuse the shared pooled session when available, else open a one-off session
+            session_context = (
+                contextlib.nullcontext(self.http_session) if self.http_session else aiohttp.ClientSession()
+            )
+            async with session_context as session:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                     if response.status == 404:
-                        logger.warning(f"No frame available in buffer for offset {offset_ms}ms")
+                        logger.warning("No frame available in buffer for offset %dms", offset_ms)
                         return None
                     elif response.status != 200:
-                        logger.error(f"Frame request failed with status {response.status}: {await response.text()}")
+                        logger.error("Frame request failed with status %d: %s", response.status, await response.text())
                         return None
 
                     # Read JPEG data
                     frame_data = await response.read()
 
             if not frame_data:
-                logger.warning(f"Empty frame data received for event: {event_type}")
+                logger.warning("Empty frame data received for event: %s", event_type)
+                return None
+
+            if self.recording_session_id != session_id:
+                logger.info("Recording session changed during capture, discarding frame for event: %s", event_type)
                 return None
 
             # Save screenshot to file
             self.screenshot_counter += 1
 
             # Include session ID in filename
-            session_part = f"{self.recording_session_id}_" if self.recording_session_id else ""
+            session_part = f"{session_id}_" if session_id else ""
             filename = f"/tmp/screenshots/{session_part}{self.screenshot_counter:04d}_{event_type}.jpg"
 
-            with open(filename, "wb") as f:
-                f.write(frame_data)
+            # Track the path in the same step as the session check above, so it can
+            # only land in the list of the session it was captured for
+            if session_id:
+                self.recorded_screenshots.append(filename)
 
-            logger.info(f"Screenshot captured from buffer: {filename} (event: {event_type}, offset: {offset_ms}ms)")
+            # Write off the event loop so concurrent MCP/Gemini I/O isn't stalled
+            try:
+                await asyncio.to_thread(Path(filename).write_bytes, frame_data)
+            except Exception:
+                if filename in self.recorded_screenshots:
+                    self.recorded_screenshots.remove(filename)
+                raise
+
+            logger.info(
+                "Screenshot captured from buffer: %s (event: %s, offset: %dms)",
+                filename, event_type, offset_ms,
+            )
             return filename
 
         except TimeoutError:
-            logger.error(f"Timeout while requesting frame from video buffer for event: {event_type}")
+            logger.error("Timeout while requesting frame from video buffer for event: %s", event_type)
             return None
         except Exception as e:
-            logger.error(f"Exception while capturing screenshot: {e}", exc_info=True)
+            logger.error("Exception while capturing screenshot: %s", e, exc_info=True)
             return None
 
     async def _execute_tool(self, tool_name: str, arguments: dict) -> MCPToolResult:
@@ -320,7 +494,7 @@ class BrowserAgent:
 
             return result
         except Exception as e:
-            logger.error(f"Tool execution error: {e}")
+            logger.error("Tool execution error: %s", e)
             return MCPToolResult(error=f"Error executing tool: {str(e)}")
 
     def _parse_response(self, text: str) -> AgentResponse:
@@ -330,45 +504,37 @@ class BrowserAgent:
         the AgentResponse schema. Falls back to extracting user_message field
         or treating the entire response as a user message if parsing fails.
         """
+        # Replies with neither a ```json block nor a leading JSON object are plain
+        # text without a tool call; skip the regex search and decoding
+        stripped = text.strip()
+        if "```json" not in text and not stripped.startswith("{"):
+            return AgentResponse(user_message=text)
+
         json_str = None
 
         try:
             # Try to find JSON code block
-            if '```json' in text:
-                block_start = text.find('```json')
-                end = text.find('```', block_start + 7)
-                if end > block_start:
-                    json_str = text[block_start + 7:end].strip()
-
-            # Try to find inline JSON object
-            elif text.strip().startswith('{'):
-                # Find matching closing brace
-                brace_count = 0
-                start = text.find('{')
-                end = start
-                for i, char in enumerate(text[start:], start):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            end = i + 1
-                            break
-                if end > start:
-                    json_str = text[start:end]
-
-            if json_str:
-                data = json.loads(json_str)
-                return AgentResponse.model_validate(data)
-
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON from response: {e}")
-            # Try to extract user_message using regex as fallback
-            extracted = self._extract_user_message_fallback(json_str or text)
-            if extracted:
-                return AgentResponse(user_message=extracted)
-        except ValidationError as e:
-            logger.warning(f"Response validation failed: {e}")
+            fence = _JSON_FENCE_RE.search(text)
+            if fence:
+                json_str = fence.group(1).strip()
+                # pydantic-core parses and validates the JSON in one pass
+                return _AGENT_RESPONSE_ADAPTER.validate_json(json_str)
+
+            # Try to find inline JSON object; raw_decode stops at its closing brace
+            if stripped.startswith("{"):
+                data, end = _JSON_DECODER.raw_decode(stripped)
+                json_str = stripped[:end]
+                return _AGENT_RESPONSE_ADAPTER.validate_python(data)
+
+        except (json.JSONDecodeError, ValidationError) as e:
+            if isinstance(e, ValidationError) and not any(err["type"] == "json_invalid" for err in e.errors()):
+                logger.warning("Response validation failed: %s", e)
+            else:
+                logger.warning("Failed to parse JSON from response: %s", e)
+                # Try to extract user_message using regex as fallback
+                extracted = self._extract_user_message_fallback(json_str or text)
+                if extracted:
+                    return AgentResponse(user_message=extracted)
 
         # Final fallback: treat the entire response as a user message
         logger.warning("Falling back to treating response as plain user message")
@@ -380,22 +546,18 @@ class BrowserAgent:
         When JSON parsing fails due to control characters or formatting issues,
         this attempts to extract just the user_message field value.
         """
-        import re
-
         # Try to find "user_message": "..." pattern
-        # Handle both single and multi-line values
-        pattern = r'"user_message"\s*:\s*"((?:[^"\\]|\\.)*)"\s*[,}]'
-        match = re.search(pattern, text, re.DOTALL)
+        match = _USER_MESSAGE_RE.search(text)
 
         if match:
             # Unescape the captured string
             raw_value = match.group(1)
             try:
-                # Use json.loads to properly unescape the string
-                unescaped = json.loads(f'"{raw_value}"')
+                # Decode as a JSON string literal to properly unescape it
+                unescaped = orjson.loads(f'"{raw_value}"')
                 logger.info("Successfully extracted user_message via regex fallback")
                 return unescaped
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # If unescaping fails, return the raw value with basic cleanup
                 logger.info("Using raw user_message from regex fallback")
                 return raw_value.replace('\\n', '\n').replace('\\"', '"')
@@ -422,13 +584,13 @@ class BrowserAgent:
                 inline_data={"mime_type": image.mime_type, "data": image.data}
             )
             parts.append(image_part)
-            logger.info(f"Adding image to message: {image.mime_type}, {len(image.data)} bytes")
+            logger.info("Adding image to message: %s, %d bytes", image.mime_type, len(image.data))
 
         # Add instruction for model (remind to use structured format)
         if result.has_images():
-            parts.append(TOOL_RESULT_REMINDER_WITH_IMAGE)
+            parts.append(TOOL_RESULT_REMINDER_WITH_IMAGE_PART)
         else:
-            parts.append(TOOL_RESULT_REMINDER)
+            parts.append(TOOL_RESULT_REMINDER_PART)
 
         return parts
 
@@ -483,26 +645,51 @@ class BrowserAgent:
             )
 
             logger.info(
-                f"Built RAG context with {len(results)} recordings, "
-                f"{sum(len(r['images']) for r in results)} total images"
+                "Built RAG context with %d recordings, %d total images",
+                len(results), sum(len(r["images"]) for r in results),
             )
             return parts
 
         except Exception as e:
-            logger.error(f"Failed to build RAG context: {e}")
+            logger.error("Failed to build RAG context: %s", e)
             return None
 
     def _dump_context(self, trigger: str) -> None:
-        """Dump the current chat context to a JSON file for debugging.
+        """Schedule a dump of the current chat context to a JSON file for debugging.
+
+        The history is snapshotted on the event loop; serialization and the file
+        write run in a worker thread so the agentic loop is not stalled.
 
         Args:
             trigger: Description of what triggered the dump (e.g., "after_message")
         """
+        history = list(self.chat.history) if self.chat and hasattr(self.chat, "history") else []
+        timestamp = datetime.now()
+
+        task = asyncio.create_task(self._write_context_dump(trigger, history, timestamp))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _write_context_dump(self, trigger: str, history: list, timestamp: datetime) -> None:
+        """Write a context dump in a worker thread, one dump at a time."""
+        async with self._dump_lock:
+            try:
+                await asyncio.to_thread(self._dump_context_sync, trigger, history, timestamp)
+            except Exception as e:
+                logger.error("Failed to dump context: %s", e)
+
+    def _dump_context_sync(self, trigger: str, chat_history: list, timestamp: datetime) -> None:
+        """Serialize a chat history snapshot and write it to the logs directory.
+
+        Args:
+            trigger: Description of what triggered the dump.
+            chat_history: Snapshot of the chat history to serialize.
+            timestamp: Time the dump was requested.
+        """
         if not LOGS_DIR.exists():
             LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = LOGS_DIR / f"context_{timestamp}_{trigger}.json"
+        filename = LOGS_DIR / f"context_{timestamp.strftime('%Y%m%d_%H%M%S_%f')}_{trigger}.json"
 
         # Stats counters
         total_messages = 0
@@ -512,45 +699,43 @@ class BrowserAgent:
         # Serialize the chat history
         history: list[dict] = []
 
-        if self.chat and hasattr(self.chat, "history"):
-            for msg in self.chat.history:
-                serialized_parts: list[dict] = []
-                role = msg.role if hasattr(msg, "role") else "unknown"
-
-                parts = msg.parts if hasattr(msg, "parts") else []
-                for part in parts:
-                    if hasattr(part, "text"):
-                        # Text part
-                        text = part.text
-                        serialized_parts.append({
-                            "type": "text",
-                            "content": text,
-                            "char_count": len(text),
-                        })
-                        total_chars += len(text)
-                    elif hasattr(part, "inline_data"):
-                        # Image/binary part
-                        size = 0
-                        if hasattr(part.inline_data, "data"):
-                            size = len(part.inline_data.data)
-                        serialized_parts.append({
-                            "type": "image",
-                            "mime_type": getattr(part.inline_data, "mime_type", "unknown"),
-                            "size_bytes": size,
-                        })
-                        total_images += 1
-                    else:
-                        # Unknown part type
-                        serialized_parts.append({
-                            "type": "unknown",
-                            "repr": str(part)[:200],
-                        })
-
-                history.append({"role": role, "parts": serialized_parts})
-                total_messages += 1
+        for msg in chat_history:
+            serialized_parts: list[dict] = []
+            role = msg.role if hasattr(msg, "role") else "unknown"
+
+            parts = msg.parts if hasattr(msg, "parts") else []
+            for part in parts:
+                # Check field presence: proto fields always exist as attributes, so
+                # hasattr() would classify image parts as empty text
+                if "inline_data" in part:
+                    # Image/binary part - record only its size, never the bytes
+                    serialized_parts.append({
+                        "type": "image",
+                        "mime_type": part.inline_data.mime_type,
+                        "size_bytes": len(part.inline_data.data),
+                    })
+                    total_images += 1
+                elif "text" in part:
+                    # Text part
+                    text = part.text
+                    serialized_parts.append({
+                        "type": "text",
+                        "content": text,
+                        "char_count": len(text),
+                    })
+                    total_chars += len(text)
+                else:
+                    # Unknown part type
+                    serialized_parts.append({
+                        "type": "unknown",
+                        "repr": str(part)[:200],
+                    })
+
+            history.append({"role": role, "parts": serialized_parts})
+            total_messages += 1
 
         context_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp.isoformat(),
             "trigger": trigger,
             "history": history,
             "stats": {
@@ -561,32 +746,84 @@ class BrowserAgent:
         }
 
         # Write to file
-        with open(filename, "w") as f:
-            json.dump(context_data, f, indent=2, default=str)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(context_data, default=str, option=orjson.OPT_INDENT_2))
 
         logger.info(
-            f"Context dumped to {filename} "
-            f"(messages={total_messages}, "
-            f"chars={total_chars}, "
-            f"images={total_images})"
+            "Context dumped to %s (messages=%d, chars=%d, images=%d)",
+            filename, total_messages, total_chars, total_images,
         )
 
-    async def process_message(self, user_message: str) -> str:
+    def _response_cache_key(self, user_message: str) -> tuple[bytes, str]:
+        """Build a response cache key from the recent history and the user message.
+
+        Image parts contribute their raw bytes, so a reply answered from a
+        screenshot is only reused when the screenshot itself is identical.
+        """
+        chat = self.chat
+        assert chat is not None, "chat not started"
+        digest = hashlib.blake2b(digest_size=16)
+        for content in chat.history[-6:]:
+            _hash_field(digest, b"R", content.role.encode())
+            for part in content.parts:
+                if "inline_data" in part:
+                    _hash_field(digest, b"I", part.inline_data.data)
+                else:
+                    _hash_field(digest, b"T", part.text.encode())
+        return digest.digest(), user_message
+
+    def _record_exchange(self, user_message: str, model_text: str) -> None:
+        """Append a user/model exchange to the chat without calling Gemini."""
+        chat = self.chat
+        assert chat is not None, "chat not started"
+        history = [
+            *chat.history,
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text=user_message)]),
+            genai.protos.Content(role="model", parts=[genai.protos.Part(text=model_text)]),
+        ]
+        self.conversation_history = history
+        self.chat = self.model.start_chat(history=history)
+
+    async def process_message(
+        self,
+        user_message: str,
+        on_event: Callable[[dict], Awaitable[None]] | None = None,
+    ) -> str:
         """Process a user message and return a response.
 
         Uses an agentic loop that continues executing tools until the LLM
         responds without a tool call, or max iterations is reached.
 
         Only user_message fields from the structured response are returned
-        to the user. Thinking is logged internally, and tool calls are
-        executed silently.
+        to the user. Thinking is logged internally.
+
+        Args:
+            user_message: The user's chat message.
+            on_event: Optional callback awaited with a tool_call event before
+                each tool runs and a tool_result event after it, so callers can
+                show progress while the turn is still running.
+
+        Returns:
+            The collected user-facing messages for this turn.
         """
         if self.chat is None:
             raise RuntimeError("Agent not initialized. Call initialize() first.")
 
+        # Trim earlier turns only; everything added from here on belongs to this turn
+        self._trim_history()
+
         try:
-            # Build RAG context if available
-            rag_context = self._build_rag_context(user_message)
+            # Repeated prompts on an identical recent history skip the LLM entirely
+            cache_key = self._response_cache_key(user_message)
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                model_text, reply = cached
+                logger.info("Returning cached response for repeated prompt")
+                self._record_exchange(user_message, model_text)
+                return reply
+
+            # Build RAG context if available (Voyage, MongoDB and image loading are blocking)
+            rag_context = await asyncio.to_thread(self._build_rag_context, user_message)
 
             # Build the message parts
             if rag_context:
@@ -611,7 +848,7 @@ class BrowserAgent:
 
                 # Log thinking (internal, not shown to user)
                 if parsed.thinking:
-                    logger.info(f"Agent thinking: {parsed.thinking}")
+                    logger.info("Agent thinking: %s", parsed.thinking)
 
                 # Collect any user message
                 if parsed.user_message:
@@ -626,32 +863,41 @@ class BrowserAgent:
                 tool_name = parsed.tool_call.name
                 arguments = parsed.tool_call.arguments
                 logger.info(
-                    f"Iteration {iterations}/{MAX_ITERATIONS}: "
-                    f"Executing tool: {tool_name} with args: {arguments}"
+                    "Iteration %d/%d: Executing tool: %s with args: %s",
+                    iterations, MAX_ITERATIONS, tool_name, arguments,
                 )
+                if on_event is not None:
+                    await on_event({"type": "tool_call", "name": tool_name, "arguments": arguments})
 
                 # Execute the tool
                 result = await self._execute_tool(tool_name, arguments)
+                if on_event is not None:
+                    await on_event({
+                        "type": "tool_result",
+                        "name": tool_name,
+                        "error": result.error,
+                        "image_count": len(result.images),
+                    })
                 result_text = result.get_text()
-                logger.info(
-                    f"Tool result: {result_text[:500] if result_text else 'No text'}..."
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Tool result: %s...", result_text[:500] if result_text else "No text")
 
-                if result.has_images():
-                    logger.info(f"Tool returned {len(result.images)} image(s)")
+                    if result.has_images():
+                        logger.info("Tool returned %d image(s)", len(result.images))
 
                 # Track consecutive failures per step
                 if result.error:
                     consecutive_failures += 1
                     logger.warning(
-                        f"Tool failed ({consecutive_failures}/{MAX_RETRIES_PER_STEP}): "
-                        f"{result.error}"
+                        "Tool failed (%d/%d): %s",
+                        consecutive_failures, MAX_RETRIES_PER_STEP, result.error,
                     )
                     if consecutive_failures >= MAX_RETRIES_PER_STEP:
                         logger.error(
-                            f"Max retries ({MAX_RETRIES_PER_STEP}) reached for step"
+                            "Max retries (%d) reached for step", MAX_RETRIES_PER_STEP
                         )
-                        self._dump_context("max_retries_per_step_reached")
+                        if DUMP_CONTEXT_ENABLED:
+                            self._dump_context("max_retries_per_step_reached")
                         user_messages.append(
                             f"I've encountered {MAX_RETRIES_PER_STEP} consecutive "
                             f"failures trying to complete this action. Last error: "
@@ -663,8 +909,8 @@ class BrowserAgent:
                     # Success - reset the failure counter
                     if consecutive_failures > 0:
                         logger.info(
-                            f"Tool succeeded, resetting failure counter "
-                            f"(was {consecutive_failures})"
+                            "Tool succeeded, resetting failure counter (was %d)",
+                            consecutive_failures,
                         )
                     consecutive_failures = 0
 
@@ -675,12 +921,14 @@ class BrowserAgent:
                 response_text = await self._send_message_with_retry(follow_up_parts)
 
                 # Dump context after each tool execution for debugging
-                self._dump_context(f"after_tool_{tool_name}_iter{iterations}")
+                if DUMP_CONTEXT_ENABLED:
+                    self._dump_context(f"after_tool_{tool_name}_iter{iterations}")
 
             else:
                 # Max iterations reached (while loop completed without break)
-                logger.warning(f"Max iterations ({MAX_ITERATIONS}) reached")
-                self._dump_context("max_iterations_reached")
+                logger.warning("Max iterations (%d) reached", MAX_ITERATIONS)
+                if DUMP_CONTEXT_ENABLED:
+                    self._dump_context("max_iterations_reached")
                 user_messages.append(
                     "I've reached the maximum number of actions I can take for this "
                     "request. Please try a simpler request or provide more specific "
@@ -688,17 +936,21 @@ class BrowserAgent:
                 )
 
             # Dump final context
-            self._dump_context("end_of_message")
+            if DUMP_CONTEXT_ENABLED:
+                self._dump_context("end_of_message")
 
             # Return collected user messages (or a default if none)
-            if user_messages:
-                return "\n\n".join(user_messages)
-            return "Task completed."
+            reply = "\n\n".join(user_messages) if user_messages else "Task completed."
+            if iterations == 0:
+                # Replies without tool calls don't depend on browser state, so they can be reused
+                _response_cache[cache_key] = (response_text, reply)
+            return reply
 
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             # Dump context on error for debugging
-            self._dump_context(f"error_{type(e).__name__}")
+            if DUMP_CONTEXT_ENABLED:
+                self._dump_context(f"error_{type(e).__name__}")
             raise
 
     async def cleanup(self):
@@ -0,0 +1,81 @@
+"""Pool of pre-warmed browser agents for WebSocket connections."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from agent import BrowserAgent
+from mcp_client import MCPClient
+
+if TYPE_CHECKING:
+    from rag_retriever import RAGRetriever
+
+logger = logging.getLogger(__name__)
+
+
+class AgentPool:
+    """Keeps initialized agents ready so connections skip agent setup.
+
+    Agents share the MCP client, RAG retriever and HTTP session. Released agents are reset
+    to a fresh chat and returned to the pool; when the pool is empty a new
+    agent is created on demand.
+    """
+
+    def __init__(
+        self,
+        mcp_client: MCPClient,
+        rag_retriever: "RAGRetriever | None" = None,
+        http_session: aiohttp.ClientSession | None = None,
+        size: int = 2,
+    ):
+        """Initialize the pool.
+
+        Args:
+            mcp_client: Shared MCP client used by every agent.
+            rag_retriever: Optional RAG retriever used by every agent.
+            http_session: Optional pooled HTTP session used by every agent.
+            size: Number of idle agents to keep ready; 0 disables pre-warming.
+
+        Raises:
+            ValueError: If size is negative.
+        """
+        if size < 0:
+            raise ValueError(f"Agent pool size must be >= 0, got {size}")
+        self.mcp_client = mcp_client
+        self.rag_retriever = rag_retriever
+        self.http_session = http_session
+        self.size = size
+        # Capacity is enforced against self.size; Queue(maxsize=0) would be unbounded
+        self._idle: asyncio.Queue[BrowserAgent] = asyncio.Queue()
+
+    def _create_agent(self) -> BrowserAgent:
+        """Create an agent with the shared clients and a fresh chat."""
+        agent = BrowserAgent()
+        agent.mcp_client = self.mcp_client
+        agent.rag_retriever = self.rag_retriever
+        agent.http_session = self.http_session
+        agent.start_chat()
+        return agent
+
+    def fill(self) -> None:
+        """Pre-warm the pool up to its size."""
+        for _ in range(self.size - self._idle.qsize()):
+            self._idle.put_nowait(self._create_agent())
+        logger.info("Agent pool filled with %d agents", self.size)
+
+    def acquire(self) -> BrowserAgent:
+        """Take an idle agent from the pool, creating one if none is available."""
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            logger.info("Agent pool exhausted, creating a new agent")
+            return self._create_agent()
+
+    def release(self, agent: BrowserAgent) -> None:
+        """Reset an agent and return it to the pool, dropping it if the pool is full."""
+        if self._idle.qsize() >= self.size:
+            return
+        agent.reset()
+        self._idle.put_nowait(agent)
@@ -1,107 +1,211 @@
 import asyncio
-import glob
-import json
+import functools
 import logging
 import os
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime
 
-from fastapi import FastAPI, Form, WebSocket, WebSocketDisconnect
+import aiohttp
+import orjson
+from fastapi import FastAPI, Form, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from agent import BrowserAgent
+from agent_pool import AgentPool
 from mcp_client import MCPClient
 from rag_retriever import RAGRetriever
 from recording_models import RecordingSession
 from recording_storage import RecordingStorage
-from voyage_service import VoyageService
+from voyage_service import EmbeddingBatcher, VoyageService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Watch and Learn Agent")
+# Recording session IDs have the form <YYYYMMDD>_<HHMMSS>_<8 hex chars>
+_SESSION_ID_RE = re.compile(r'^\d{8}_\d{6}_[a-f0-9]{8}\Z')
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Constant WebSocket frames, encoded once
+_STATUS_THINKING_FRAME = orjson.dumps({"type": "status", "content": "thinking"}).decode()
+
+# Constant HTTP response bodies, encoded once
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+_RECORDING_STOPPED_BODY = orjson.dumps({"status": "stopped", "recording": False})
+_NOT_RECORDING_BODY = orjson.dumps({"status": "not_recording", "filename": None})
+
+# Text frames queued in the same tick are sent as one {"type": "batch", "items": [...]} frame
+_BATCH_FRAME_PREFIX = '{"type":"batch","items":['
+_BATCH_FRAME_SUFFIX = ']}'
+
+# Outgoing frames buffered per connection before producers wait on the writer
+SEND_QUEUE_SIZE = 32
 
 # Store active connections and their agents
-active_connections: dict[str, tuple[WebSocket, BrowserAgent]] = {}
+active_connections: dict[int, BrowserAgent] = {}
 
-# Shared MCP client for all agents
+# Number of pre-warmed agents kept ready for new WebSocket connections
+AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "2"))
 
+# Shared MCP client for all agents, set once during startup
 shared_mcp_client: MCPClient | None = None
-shared_mcp_lock: asyncio.Lock | None = None
+
+# Pre-warmed agents for WebSocket connections
+agent_pool: AgentPool | None = None
+
+# Pooled HTTP session shared by all agents (video buffer frame requests)
+http_session: aiohttp.ClientSession | None = None
 
 # Global recording agent for manual control mode
 recording_agent: BrowserAgent | None = None
-recording_agent_lock: asyncio.Lock | None = None
+recording_agent_lock = asyncio.Lock()
 
 # MongoDB storage, Voyage AI service, and RAG retriever
 recording_storage: RecordingStorage | None = None
 voyage_service: VoyageService | None = None
+embedding_batcher: EmbeddingBatcher | None = None
 rag_retriever: RAGRetriever | None = None
 
 
-@app.on_event("startup")
-async def startup_event():
-    global recording_agent_lock, shared_mcp_lock, shared_mcp_client
-    global recording_storage, voyage_service, rag_retriever
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global shared_mcp_client, agent_pool, http_session
+    global recording_storage, voyage_service, embedding_batcher, rag_retriever
 
-    recording_agent_lock = asyncio.Lock()
-    shared_mcp_lock = asyncio.Lock()
+    # Keep-alive connection pool reused across screenshot captures
+    http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+    )
 
-    # Initialize MongoDB storage
-    logger.info("Initializing MongoDB storage")
+    # Everything below is torn down in finally, on shutdown or when startup fails
     try:
-        recording_storage = RecordingStorage()
-        recording_storage.connect()
-        logger.info("MongoDB storage initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to connect to MongoDB: {e}")
-        # Continue without MongoDB - recording storage will be unavailable
+        # Initialize MongoDB storage
+        logger.info("Initializing MongoDB storage")
+        try:
+            recording_storage = RecordingStorage()
+            recording_storage.connect()
+            logger.info("MongoDB storage initialized successfully")
+        except Exception as e:
+            logger.error("Failed to connect to MongoDB: %s", e)
+            # Continue without MongoDB - recording storage will be unavailable
 
-    # Initialize Voyage AI service
-    logger.info("Initializing Voyage AI service")
-    try:
-        voyage_service = VoyageService()
-        logger.info("Voyage AI service initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Voyage AI: {e}")
-        # Continue without Voyage - embedding will be unavailable
+        # Initialize Voyage AI service
+        logger.info("Initializing Voyage AI service")
+        try:
+            voyage_service = VoyageService()
+            embedding_batcher = EmbeddingBatcher(voyage_service)
+            embedding_batcher.start()
+            logger.info("Voyage AI service initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize Voyage AI: %s", e)
+            # Continue without Voyage - embedding will be unavailable
 
-    # Initialize RAG retriever if both storage and voyage are available
-    if recording_storage and voyage_service:
-        logger.info("Initializing RAG retriever")
-        rag_retriever = RAGRetriever(recording_storage, voyage_service)
-        logger.info("RAG retriever initialized successfully")
+        # Initialize RAG retriever if both storage and voyage are available
+        if recording_storage and voyage_service:
+            logger.info("Initializing RAG retriever")
+            rag_retriever = RAGRetriever(recording_storage, voyage_service)
+            logger.info("RAG retriever initialized successfully")
 
-    # Initialize shared MCP client on startup with retries
-    logger.info("Initializing shared MCP client on startup")
-    max_retries = 10
-    retry_delay = 2
+        # Initialize shared MCP client on startup with retries
+        logger.info("Initializing shared MCP client on startup")
+        max_retries = 10
+        retry_delay = 2
 
-    for attempt in range(max_retries):
+        for attempt in range(max_retries):
+            try:
+                shared_mcp_client = MCPClient(os.getenv("MCP_SERVER_URL", "http://playwright-browser:3001"))
+                await shared_mcp_client.connect()
+                logger.info("Shared MCP client initialized successfully")
+                break
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    logger.warning("Failed to connect to MCP server (attempt %d/%d): %s", attempt + 1, max_retries, e)
+                    await asyncio.sleep(retry_delay)
+                else:
+                    logger.error("Failed to connect to MCP server after %d attempts", max_retries)
+                    raise
+
+        # Build the system prompt exchange once for every agent
+        mcp_client = get_shared_mcp_client()
+        BrowserAgent.cache_initial_history(mcp_client)
+
+        # Pre-warming is best effort: agent setup errors (e.g. a missing GEMINI_API_KEY)
+        # surface when a WebSocket connects rather than failing startup
+        agent_pool = AgentPool(mcp_client, rag_retriever, http_session, size=AGENT_POOL_SIZE)
         try:
-            shared_mcp_client = MCPClient(os.getenv("MCP_SERVER_URL", "http://playwright-browser:3001"))
-            await shared_mcp_client.connect()
-            logger.info("Shared MCP client initialized successfully")
-            break
+            agent_pool.fill()
         except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Failed to connect to MCP server (attempt {attempt + 1}/{max_retries}): {e}")
-                await asyncio.sleep(retry_delay)
-            else:
-                logger.error(f"Failed to connect to MCP server after {max_retries} attempts")
-                raise
+            logger.error("Failed to pre-warm agent pool: %s", e)
 
+        yield
+    finally:
+        if embedding_batcher:
+            await embedding_batcher.stop()
+        await http_session.close()
+        if shared_mcp_client:
+            await shared_mcp_client.disconnect()
 
-async def get_shared_mcp_client() -> MCPClient:
-    """Get the shared MCP client."""
-    global shared_mcp_client
 
+app = FastAPI(title="Watch and Learn Agent", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+async def websocket_writer(websocket: WebSocket, send_queue: asyncio.Queue[str | bytes]) -> None:
+    """Send queued frames to the client: str as text frames, bytes as binary frames.
+
+    Text frames that are ready together are coalesced into a single batch frame.
+    Binary frames are never batched and keep their position in the stream.
+    """
+    held: bytes | None = None
+    while True:
+        frame = held if held is not None else await send_queue.get()
+        held = None
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+            continue
+
+        # Let producers finish enqueueing this tick's frames, then drain them
+        await asyncio.sleep(0)
+        frames = [frame]
+        while not send_queue.empty():
+            next_frame = send_queue.get_nowait()
+            if isinstance(next_frame, bytes):
+                held = next_frame
+                break
+            frames.append(next_frame)
+
+        if len(frames) == 1:
+            await websocket.send_text(frame)
+        else:
+            # Frames are already encoded JSON objects, so the batch is built by joining them
+            await websocket.send_text(_BATCH_FRAME_PREFIX + ",".join(frames) + _BATCH_FRAME_SUFFIX)
+
+
+async def enqueue_frame(send_queue: asyncio.Queue[str | bytes], frame: str | bytes) -> None:
+    """Queue a pre-encoded frame for the connection's writer.
+
+    Status frames are advisory, so when the client has fallen behind and the
+    queue is full they are dropped instead of blocking the agent.
+    """
+    if frame is _STATUS_THINKING_FRAME and send_queue.full():
+        return
+    await send_queue.put(frame)
+
+
+async def enqueue_json_frame(send_queue: asyncio.Queue[str | bytes], message: dict) -> None:
+    """Queue a message as a JSON text frame encoded with orjson."""
+    await enqueue_frame(send_queue, orjson.dumps(message).decode())
+
+
+def get_shared_mcp_client() -> MCPClient:
+    """Get the shared MCP client."""
     if shared_mcp_client is None:
         raise RuntimeError("Shared MCP client not initialized. This should not happen.")
 
@@ -111,108 +215,115 @@ async def get_shared_mcp_client() -> MCPClient:
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    connection_id = str(id(websocket))
-
-    # Create agent for this connection with shared MCP client
-    agent = BrowserAgent()
-    agent.mcp_client = await get_shared_mcp_client()
-    agent.rag_retriever = rag_retriever  # Set RAG retriever for context
-    # Initialize chat without reinitializing MCP
-    system_prompt = agent._build_system_prompt()
-    agent.conversation_history = [
-        {"role": "user", "parts": [system_prompt]},
-        {"role": "model", "parts": ["Understood. I'm ready to help you interact with the browser. What would you like me to do?"]}
-    ]
-    agent.chat = agent.model.start_chat(history=agent.conversation_history)
-    active_connections[connection_id] = (websocket, agent)
-
-    logger.info(f"Client connected: {connection_id}")
+    connection_id = id(websocket)
+
+    # Take a pre-warmed agent (shared MCP client, fresh chat) for this connection
+    assert agent_pool is not None, "agent_pool not initialized"
+    agent = agent_pool.acquire()
+
+    # Frames are sent by a dedicated writer so a slow client never stalls the agent.
+    # The task group ties the writer's lifetime to the receive loop: whichever
+    # fails first cancels the other.
+    send_queue: asyncio.Queue[str | bytes] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
 
     try:
-        while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-
-            if message.get("type") == "set_recording":
-                # Handle recording state change
-                is_recording = message.get("recording", False)
-                agent.set_recording(is_recording)
-                logger.info(f"Recording state changed to: {is_recording}")
-                await websocket.send_json({
-                    "type": "recording_status",
-                    "recording": is_recording,
-                    "session_id": agent.recording_session_id
-                })
-
-            elif message.get("type") == "message":
-                user_content = message.get("content", "")
-                logger.info(f"Received message: {user_content}")
-
-                # Check if we should inject demo content (first message only)
-                demo_metadata = None
-                if not agent.demo_injected:
-                    demo_metadata = await agent.inject_demo_content()
-                    if demo_metadata:
-                        # Send memory message immediately
-                        await websocket.send_json({
-                            "type": "memory_injected",
-                            "metadata": demo_metadata
-                        })
-                        logger.info("Sent memory_injected message to client")
-
-                # Send status update
-                await websocket.send_json({
-                    "type": "status",
-                    "content": "thinking"
-                })
-
-                # Process with agent
-                try:
-                    response = await agent.process_message(user_content)
-                    await websocket.send_json({
-                        "type": "response",
-                        "content": response
-                    })
-                except Exception as e:
-                    logger.error(f"Agent error: {e}")
-                    await websocket.send_json({
-                        "type": "response",
-                        "content": f"Sorry, I encountered an error: {str(e)}"
+        active_connections[connection_id] = agent
+        logger.info("Client connected: %d", connection_id)
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(websocket_writer(websocket, send_queue))
+
+            while True:
+                data = await websocket.receive_text()
+                message = orjson.loads(data)
+
+                if message.get("type") == "set_recording":
+                    # Handle recording state change
+                    is_recording = message.get("recording", False)
+                    agent.set_recording(is_recording)
+                    logger.info("Recording state changed to: %s", is_recording)
+                    await enqueue_json_frame(send_queue, {
+                        "type": "recording_status",
+                        "recording": is_recording,
+                        "session_id": agent.recording_session_id
                     })
 
-    except WebSocketDisconnect:
-        logger.info(f"Client disconnected: {connection_id}")
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+                elif message.get("type") == "message":
+                    user_content = message.get("content", "")
+                    logger.info("Received message: %.200s", user_content)
+
+                    # Check if we should inject demo content (first message only)
+                    demo_metadata = None
+                    if not agent.demo_injected:
+                        demo_metadata = await agent.inject_demo_content()
+                        if demo_metadata:
+                            # Send memory message immediately; the thumbnail follows as a
+                            # binary frame instead of base64 inside the JSON
+                            thumbnail = demo_metadata.pop("thumbnail", None)
+                            await enqueue_json_frame(send_queue, {
+                                "type": "memory_injected",
+                                "metadata": demo_metadata,
+                                "has_thumbnail": thumbnail is not None,
+                            })
+                            if thumbnail is not None:
+                                await enqueue_frame(send_queue, thumbnail)
+                            logger.info("Sent memory_injected message to client")
+
+                    # Send status update
+                    await enqueue_frame(send_queue, _STATUS_THINKING_FRAME)
+
+                    # Process with agent
+                    try:
+                        # Tool progress goes out through the same queue as the final response
+                        response = await agent.process_message(
+                            user_content,
+                            on_event=functools.partial(enqueue_json_frame, send_queue),
+                        )
+                        await enqueue_json_frame(send_queue, {
+                            "type": "response",
+                            "content": response
+                        })
+                    except Exception as e:
+                        logger.error("Agent error: %s", e)
+                        await enqueue_json_frame(send_queue, {
+                            "type": "response",
+                            "content": f"Sorry, I encountered an error: {str(e)}"
+                        })
+
+    except* WebSocketDisconnect:
+        logger.info("Client disconnected: %d", connection_id)
+    except* Exception as eg:
+        logger.error("WebSocket error: %s", eg.exceptions)
     finally:
         # Cleanup - don't disconnect shared MCP client
-        if connection_id in active_connections:
-            del active_connections[connection_id]
+        active_connections.pop(connection_id, None)
+        agent_pool.release(agent)
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 async def get_or_create_recording_agent() -> BrowserAgent:
     """Get or create the global recording agent with shared MCP client."""
     global recording_agent
 
-    assert recording_agent_lock is not None, "recording_agent_lock not initialized"
+    # Fast path: once created, the agent is read without touching the lock
+    if recording_agent is not None:
+        return recording_agent
+
     async with recording_agent_lock:
         if recording_agent is None:
             logger.info("Creating new recording agent")
-            recording_agent = BrowserAgent()
-            recording_agent.mcp_client = await get_shared_mcp_client()
-            recording_agent.rag_retriever = rag_retriever  # Set RAG retriever for context
+            agent = BrowserAgent()
+            agent.mcp_client = get_shared_mcp_client()
+            agent.rag_retriever = rag_retriever  # Set RAG retriever for context
+            agent.http_session = http_session
             # Initialize chat without reinitializing MCP
-            system_prompt = recording_agent._build_system_prompt()
-            recording_agent.conversation_history = [
-                {"role": "user", "parts": [system_prompt]},
-                {"role": "model", "parts": ["Understood. I'm ready to help you interact with the browser. What would you like me to do?"]}
-            ]
-            recording_agent.chat = recording_agent.model.start_chat(history=recording_agent.conversation_history)
+            agent.start_chat()
+            # Publish only once fully initialized so fast-path readers never see a partial agent
+            recording_agent = agent
             logger.info("Recording agent initialized with shared MCP client")
         return recording_agent
 
@@ -222,11 +333,11 @@ async def start_recording():
     """Enable recording mode"""
     agent = await get_or_create_recording_agent()
     agent.set_recording(True)
-    return {
+    return ORJSONResponse({
         "status": "recording",
         "recording": True,
         "session_id": agent.recording_session_id
-    }
+    })
 
 
 @app.post("/recording/stop")
@@ -237,7 +348,7 @@ async def stop_recording():
     if recording_agent:
         recording_agent.set_recording(False)
 
-    return {"status": "stopped", "recording": False}
+    return Response(_RECORDING_STOPPED_BODY, media_type="application/json")
 
 
 @app.post("/recording/screenshot")
@@ -247,33 +358,77 @@ async def capture_screenshot(event_type: str = "manual"):
 
     if agent.is_recording:
         filename = await agent._capture_screenshot(event_type)
-        return {"status": "captured", "filename": filename}
+        return ORJSONResponse({"status": "captured", "filename": filename})
+
+    return Response(_NOT_RECORDING_BODY, media_type="application/json")
+
+
+def find_session_screenshots(session_id: str) -> list[str]:
+    """Return sorted paths of a session's .jpg/.png screenshots in a single directory scan."""
+    prefix = f"{session_id}_"
+    try:
+        with os.scandir("/tmp/screenshots") as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith((".jpg", ".png"))
+            )
+    except FileNotFoundError:
+        return []
+
+
+def get_recorded_screenshots(session_id: str) -> list[str] | None:
+    """Return the screenshot paths tracked by the agent that recorded session_id, if still known."""
+    agents = [recording_agent, *active_connections.values()]
+    for agent in agents:
+        if agent and agent.recorded_session_id == session_id and agent.recorded_screenshots:
+            return list(agent.recorded_screenshots)
+    return None
 
-    return {"status": "not_recording", "filename": None}
+
+@app.get("/recording/paths/{session_id}")
+async def get_recording_paths(session_id: str):
+    """List the screenshot paths captured for a recording session."""
+    if not _SESSION_ID_RE.match(session_id):
+        return ORJSONResponse({"status": "error", "message": "Invalid session_id format"}, status_code=400)
+
+    screenshot_paths = get_recorded_screenshots(session_id)
+    if screenshot_paths is None:
+        screenshot_paths = await asyncio.to_thread(find_session_screenshots, session_id)
+
+    return {"session_id": session_id, "screenshot_paths": screenshot_paths}
+
+
+def write_metadata(path: str, metadata: dict) -> None:
+    """Write recording metadata as indented JSON.
+
+    Writes to a temporary file and renames it into place so readers never see
+    a partially written file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
 
 
 @app.post("/recording/metadata")
 async def save_recording_metadata(session_id: str = Form(...), description: str = Form(...)):
     """Save metadata for a recording session with vector embedding."""
-    import re
-    from datetime import datetime
-
     # Validate session_id format (timestamp_uuid)
-    if not re.match(r'^\d{8}_\d{6}_[a-f0-9]{8}$', session_id):
-        return {"status": "error", "message": "Invalid session_id format"}, 400
+    if not _SESSION_ID_RE.match(session_id):
+        return ORJSONResponse({"status": "error", "message": "Invalid session_id format"}, status_code=400)
 
     # Validate description is non-empty
-    if not description.strip():
-        return {"status": "error", "message": "Description is required"}, 400
+    description_clean = description.strip()
+    if not description_clean:
+        return ORJSONResponse({"status": "error", "message": "Description is required"}, status_code=400)
 
     try:
-        description_clean = description.strip()
-
-        # Find all screenshots for this session (both .jpg from video buffer and .png from legacy)
-        screenshot_pattern_jpg = f"/tmp/screenshots/{session_id}_*.jpg"
-        screenshot_pattern_png = f"/tmp/screenshots/{session_id}_*.png"
-        screenshot_paths = sorted(glob.glob(screenshot_pattern_jpg) + glob.glob(screenshot_pattern_png))
-        logger.info(f"Found {len(screenshot_paths)} screenshots for session {session_id}")
+        # Use the paths tracked by the recording agent; fall back to scanning the
+        # directory (both .jpg from video buffer and .png from legacy sessions)
+        screenshot_paths = get_recorded_screenshots(session_id)
+        if screenshot_paths is None:
+            screenshot_paths = await asyncio.to_thread(find_session_screenshots, session_id)
+        logger.info("Found %d screenshots for session %s", len(screenshot_paths), session_id)
 
         # Create metadata object (still save JSON for backward compatibility)
         metadata = {
@@ -285,20 +440,19 @@ async def save_recording_metadata(session_id: str = Form(...), description: str
 
         # Save to JSON file
         metadata_path = f"/tmp/screenshots/{session_id}_metadata.json"
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        await asyncio.to_thread(write_metadata, metadata_path, metadata)
 
         # Embed and store in MongoDB if services are available
         embedding = None
         stored_in_db = False
 
-        if voyage_service:
+        if embedding_batcher:
             try:
-                logger.info(f"Embedding description for session {session_id}")
-                embedding = voyage_service.embed_document(description_clean)
-                logger.info(f"Embedding created: {len(embedding)} dimensions")
+                logger.info("Embedding description for session %s", session_id)
+                embedding = await embedding_batcher.embed_document(description_clean)
+                logger.info("Embedding created: %d dimensions", len(embedding))
             except Exception as e:
-                logger.error(f"Failed to create embedding: {e}")
+                logger.error("Failed to create embedding: %s", e)
 
         if recording_storage and embedding:
             try:
@@ -308,13 +462,13 @@ async def save_recording_metadata(session_id: str = Form(...), description: str
                     embedding=embedding,
                     screenshot_paths=screenshot_paths,
                 )
-                recording_storage.save_recording(recording)
+                await asyncio.to_thread(recording_storage.save_recording, recording)
                 stored_in_db = True
-                logger.info(f"Recording saved to MongoDB: {session_id}")
+                logger.info("Recording saved to MongoDB: %s", session_id)
             except Exception as e:
-                logger.error(f"Failed to save to MongoDB: {e}")
+                logger.error("Failed to save to MongoDB: %s", e)
 
-        logger.info(f"Metadata saved for session {session_id}: {description_clean[:50]}...")
+        logger.info("Metadata saved for session %s: %.50s...", session_id, description_clean)
         return {
             "status": "success",
             "metadata_path": metadata_path,
@@ -323,10 +477,19 @@ async def save_recording_metadata(session_id: str = Form(...), description: str
         }
 
     except Exception as e:
-        logger.error(f"Error saving metadata: {e}")
-        return {"status": "error", "message": str(e)}, 500
+        logger.error("Error saving metadata: %s", e)
+        return ORJSONResponse({"status": "error", "message": str(e)}, status_code=500)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        access_log=False,
+        ws_per_message_deflate=False,
+    )
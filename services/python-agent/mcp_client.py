@@ -4,13 +4,28 @@ Uses a persistent SSE connection to maintain session state, preventing
 element refs from becoming stale between tool calls.
 """
 
-import base64
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
+import pybase64
+
+from prompts import format_tools_description
+
 logger = logging.getLogger(__name__)
 
+# SIMD base64 decoder (AVX2/NEON with scalar fallback), bound once for the image path
+_b64decode = pybase64.b64decode
+
+# Encoded image size above which a tool result is parsed off the event loop
+OFFLOAD_DECODE_THRESHOLD = 64 * 1024
+
+# Bounded pool for large image decodes, separate from the default to_thread pool
+_decode_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="mcp-decode")
+
 
 @dataclass
 class MCPTool:
@@ -30,23 +45,40 @@ class MCPImageContent:
 
     @classmethod
     def from_mcp_content(cls, content: Any) -> "MCPImageContent | None":
-        """Create from MCP content object with image data."""
+        """Create from MCP content object with image data.
+
+        The base64 str is handed to the decoder as-is; pybase64 reads ASCII str
+        input directly, with no intermediate bytes copy. Empty payloads are
+        skipped without decoding.
+        """
         # Handle both dict format and object format
         if hasattr(content, "data") and hasattr(content, "mimeType"):
-            try:
-                image_bytes = base64.b64decode(content.data)
-                return cls(data=image_bytes, mime_type=content.mimeType)
-            except Exception as e:
-                logger.error(f"Failed to decode image data: {e}")
+            data = content.data
+            mime_type = content.mimeType
         elif isinstance(content, dict) and content.get("type") == "image":
-            data = content.get("data", "")
+            data = content.get("data")
             mime_type = content.get("mimeType", "image/png")
-            try:
-                image_bytes = base64.b64decode(data)
-                return cls(data=image_bytes, mime_type=mime_type)
-            except Exception as e:
-                logger.error(f"Failed to decode image data: {e}")
-        return None
+        else:
+            return None
+
+        if not data:
+            logger.warning("Image content has no data")
+            return None
+
+        try:
+            return cls(data=_b64decode(data), mime_type=mime_type)
+        except Exception as e:
+            logger.error(f"Failed to decode image data: {e}")
+            return None
+
+
+def _encoded_image_size(content: Any) -> int:
+    """Return the length of a content item's base64 image data, or 0 if it has none."""
+    if isinstance(content, dict):
+        data = content.get("data") if content.get("type") == "image" else None
+    else:
+        data = getattr(content, "data", None)
+    return len(data) if isinstance(data, str) else 0
 
 
 @dataclass
@@ -103,6 +135,22 @@ class MCPToolResult:
 
         return tool_result
 
+    @classmethod
+    async def from_mcp_response_async(cls, result: Any) -> "MCPToolResult":
+        """Parse an MCP tool response, decoding large images off the event loop.
+
+        Results whose base64 images are all below OFFLOAD_DECODE_THRESHOLD are
+        parsed inline, where the thread hop would cost more than the decode.
+        """
+        content_list = getattr(result, "content", [])
+        if not isinstance(content_list, list):
+            content_list = [content_list]
+
+        if any(_encoded_image_size(content) > OFFLOAD_DECODE_THRESHOLD for content in content_list):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_decode_executor, cls.from_mcp_response, result)
+        return cls.from_mcp_response(result)
+
     def has_images(self) -> bool:
         """Check if result contains any images."""
         return len(self.images) > 0
@@ -112,6 +160,58 @@ class MCPToolResult:
         return "\n".join(self.text_content)
 
 
+# Tools advertised when the MCP server is unreachable; built once since they never change
+FALLBACK_TOOLS: tuple[MCPTool, ...] = (
+    MCPTool(
+        name="browser_navigate",
+        description="Navigate to a URL",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "URL to navigate to"}
+            },
+            "required": ["url"],
+        },
+    ),
+    MCPTool(
+        name="browser_click",
+        description="Click on an element",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "element": {
+                    "type": "string",
+                    "description": "Element description",
+                },
+                "ref": {"type": "string", "description": "Element reference"},
+            },
+            "required": ["element", "ref"],
+        },
+    ),
+    MCPTool(
+        name="browser_type",
+        description="Type text into an element",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "element": {
+                    "type": "string",
+                    "description": "Element description",
+                },
+                "ref": {"type": "string", "description": "Element reference"},
+                "text": {"type": "string", "description": "Text to type"},
+            },
+            "required": ["element", "ref", "text"],
+        },
+    ),
+    MCPTool(
+        name="browser_snapshot",
+        description="Get accessibility snapshot of the page",
+        input_schema={"type": "object", "properties": {}},
+    ),
+)
+
+
 class MCPClient:
     """Client for communicating with MCP server over SSE transport.
 
@@ -122,6 +222,8 @@ class MCPClient:
     def __init__(self, server_url: str):
         self.server_url = server_url.rstrip("/")
         self.tools: list[MCPTool] = []
+        self._tools_for_llm: list[dict] = []
+        self._tools_description: str | None = None
         self._client: Any = None
         self._session: Any = None
         self._is_connected: bool = False
@@ -131,6 +233,13 @@ class MCPClient:
         """Return whether connected to MCP server."""
         return self._is_connected
 
+    @property
+    def tools_description(self) -> str:
+        """Return tool schemas rendered for the system prompt, computed once per connection."""
+        if self._tools_description is None:
+            self._tools_description = format_tools_description(self.get_tools_for_llm())
+        return self._tools_description
+
     @property
     def sse_url(self) -> str:
         """Return the SSE endpoint URL."""
@@ -166,7 +275,7 @@ class MCPClient:
 
             # List available tools
             tools_response = await self._session.list_tools()
-            self.tools = [
+            self._set_tools([
                 MCPTool(
                     name=tool.name,
                     description=tool.description or "",
@@ -175,7 +284,7 @@ class MCPClient:
                     ),
                 )
                 for tool in tools_response.tools
-            ]
+            ])
 
             logger.info(f"Connected to MCP server with {len(self.tools)} tools")
             logger.debug(f"Available tools: {[t.name for t in self.tools]}")
@@ -184,60 +293,25 @@ class MCPClient:
             logger.error(f"Failed to connect to MCP server: {e}")
             self._is_connected = False
             # Use fallback tools if connection fails
-            self.tools = self._get_fallback_tools()
+            self._set_tools(self._get_fallback_tools())
             raise
 
+    def _set_tools(self, tools: list[MCPTool]) -> None:
+        """Replace the tool list and rebuild the derived LLM/prompt views."""
+        self.tools = tools
+        self._tools_for_llm = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.input_schema,
+            }
+            for tool in tools
+        ]
+        self._tools_description = None
+
     def _get_fallback_tools(self) -> list[MCPTool]:
         """Fallback tools when MCP server is not available."""
-        return [
-            MCPTool(
-                name="browser_navigate",
-                description="Navigate to a URL",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "url": {"type": "string", "description": "URL to navigate to"}
-                    },
-                    "required": ["url"],
-                },
-            ),
-            MCPTool(
-                name="browser_click",
-                description="Click on an element",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "element": {
-                            "type": "string",
-                            "description": "Element description",
-                        },
-                        "ref": {"type": "string", "description": "Element reference"},
-                    },
-                    "required": ["element", "ref"],
-                },
-            ),
-            MCPTool(
-                name="browser_type",
-                description="Type text into an element",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "element": {
-                            "type": "string",
-                            "description": "Element description",
-                        },
-                        "ref": {"type": "string", "description": "Element reference"},
-                        "text": {"type": "string", "description": "Text to type"},
-                    },
-                    "required": ["element", "ref", "text"],
-                },
-            ),
-            MCPTool(
-                name="browser_snapshot",
-                description="Get accessibility snapshot of the page",
-                input_schema={"type": "object", "properties": {}},
-            ),
-        ]
+        return list(FALLBACK_TOOLS)
 
     async def call_tool(self, tool_name: str, arguments: dict) -> MCPToolResult:
         """Call a tool on the MCP server and return structured result."""
@@ -246,21 +320,17 @@ class MCPClient:
 
         try:
             result = await self._session.call_tool(tool_name, arguments)
-            return MCPToolResult.from_mcp_response(result)
+            return await MCPToolResult.from_mcp_response_async(result)
         except Exception as e:
             logger.error(f"Tool execution error: {e}")
             return MCPToolResult(error=f"Error executing tool: {e!s}")
 
     def get_tools_for_llm(self) -> list[dict]:
-        """Get tool definitions in a format suitable for LLM function calling."""
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.input_schema,
-            }
-            for tool in self.tools
-        ]
+        """Get tool definitions in a format suitable for LLM function calling.
+
+        The list is built once when tools are loaded; callers must not mutate it.
+        """
+        return self._tools_for_llm
 
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
@@ -31,17 +31,27 @@ def format_tool_schema(tool: dict) -> str:
     return tool_entry
 
 
-def build_system_prompt(tools: list[dict]) -> str:
-    """Build the system prompt with available tools and their parameter schemas.
+def format_tools_description(tools: list[dict]) -> str:
+    """Format all tool schemas for the "Available Tools" section of the system prompt.
 
     Args:
         tools: List of tool definitions from MCP client.
 
     Returns:
-        Complete system prompt string.
+        Formatted string describing every tool.
     """
-    tools_desc = "\n".join(format_tool_schema(t) for t in tools)
+    return "\n".join(format_tool_schema(t) for t in tools)
+
+
+def build_system_prompt(tools_desc: str) -> str:
+    """Build the system prompt with available tools and their parameter schemas.
 
+    Args:
+        tools_desc: Tool descriptions rendered by format_tools_description.
+
+    Returns:
+        Complete system prompt string.
+    """
     return f"""You are a helpful browser automation assistant. You can control a web browser to help users accomplish tasks that the user explicitly asks for. When a task is complete, confirm completion with the user before taking further actions.
 
 ## Response Format
@@ -1,5 +1,7 @@
 """Voyage AI service for embeddings and reranking."""
 
+import asyncio
+import contextlib
 import logging
 
 import voyageai
@@ -28,12 +30,23 @@ class VoyageService:
         Returns:
             Embedding vector.
         """
+        return self.embed_documents([text])[0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed several documents for storage in a single request.
+
+        Args:
+            texts: Document texts to embed.
+
+        Returns:
+            Embedding vectors, in the same order as texts.
+        """
         result = self.client.embed(
-            [text],
+            texts,
             model=Config.VOYAGE_EMBED_MODEL,
             input_type="document",
         )
-        return result.embeddings[0]
+        return result.embeddings
 
     def embed_query(self, query: str) -> list[float]:
         """Embed a query for retrieval.
@@ -87,3 +100,93 @@ class VoyageService:
             }
             for r in result.results
         ]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent document embedding requests into batched Voyage calls.
+
+    Requests arriving within a short window are embedded with a single
+    embed_documents call, run in a worker thread so the event loop never
+    blocks on the Voyage round-trip.
+    """
+
+    def __init__(
+        self,
+        voyage: VoyageService,
+        max_batch_size: int = 128,
+        batch_window: float = 0.05,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            voyage: Voyage AI service used for the batched calls.
+            max_batch_size: Maximum number of texts per embed call.
+            batch_window: Seconds to wait for more requests after the first.
+        """
+        self.voyage = voyage
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background task that drains the request queue."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and fail any requests still waiting on it."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+
+    async def embed_document(self, text: str) -> list[float]:
+        """Embed a document for storage as part of the next batch.
+
+        Args:
+            text: Document text to embed.
+
+        Returns:
+            Embedding vector.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect requests for one batch window and embed them together."""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await asyncio.sleep(self.batch_window)
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                texts = [text for text, _ in batch]
+                embeddings = await asyncio.to_thread(self.voyage.embed_documents, texts)
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"Voyage returned {len(embeddings)} embeddings for {len(batch)} documents")
+
+                logger.info("Embedded batch of %d documents", len(texts))
+                for (_, future), embedding in zip(batch, embeddings, strict=True):
+                    if not future.done():
+                        future.set_result(embedding)
+            except asyncio.CancelledError:
+                # Stopping mid-batch: don't leave the collected requests waiting forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Embedding batcher stopped"))
+                raise
+            except Exception as e:
+                # Fail this batch but keep the loop alive for later requests
+                logger.error("Batched embedding of %d documents failed: %s", len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)